@@ -35,16 +35,40 @@ print("abdomen_y name:",
       mujoco.mj_id2name(model, mujoco.mjtObj.mjOBJ_JOINT, TORSO_PITCH_JOINT))
 
 
+# Resolve actuator / joint ids once; the sim loop only indexes by int
+SIDES = ("right", "left")
+
+HIP_AIDS = np.array([
+    mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_ACTUATOR, f"hip_y_{side}")
+    for side in SIDES
+])
+ANKLE_AIDS = np.array([
+    mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_ACTUATOR, f"ankle_x_{side}")
+    for side in SIDES
+])
+ANKLE_JIDS = np.array([
+    mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_JOINT, f"ankle_x_{side}")
+    for side in SIDES
+])
+ANKLE_QADR = model.jnt_qposadr[ANKLE_JIDS]
+ANKLE_VADR = model.jnt_dofadr[ANKLE_JIDS]
+
+# Names for the debug prints, looked up once
+GEOM_NAMES = [
+    mujoco.mj_id2name(model, mujoco.mjtObj.mjOBJ_GEOM, i)
+    for i in range(model.ngeom)
+]
+FOOT_BIDS = {
+    foot: mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_BODY, foot)
+    for foot in ("foot_right", "foot_left")
+}
+
+
 def hip_balance_control(model, data, kp=10.0, kd=1.0):
     torso_angle  = data.qpos[torso_qadr]
     torso_angvel = data.qvel[torso_vadr]
 
-    for side in ("right", "left"):
-        aid = mujoco.mj_name2id(
-            model, mujoco.mjtObj.mjOBJ_ACTUATOR, f"hip_y_{side}"
-        )
-
-        data.ctrl[aid] = -kp * torso_angle - kd * torso_angvel
+    data.ctrl[HIP_AIDS] = -kp * torso_angle - kd * torso_angvel
 
 
 def ankle_balance_control(model, data, kp=3.0, kd=0.3):
@@ -54,21 +78,11 @@ def ankle_balance_control(model, data, kp=3.0, kd=0.3):
     Motors exist in your XML with names:
       ankle_x_right, ankle_x_left
     """
-    for side in ("right", "left"):
-        jname = f"ankle_x_{side}"
-        aname = f"ankle_x_{side}"
-
-        jid = mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_JOINT, jname)
-        aid = mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_ACTUATOR, aname)
+    angles  = data.qpos[ANKLE_QADR]   # rad
+    angvels = data.qvel[ANKLE_VADR]   # rad/s
 
-        qadr = model.jnt_qposadr[jid]
-        vadr = model.jnt_dofadr[jid]
-
-        angle  = data.qpos[qadr]   # rad
-        angvel = data.qvel[vadr]   # rad/s
-
-        # PD toward 0 angle
-        data.ctrl[aid] = -kp * angle - kd * angvel
+    # PD toward 0 angle
+    data.ctrl[ANKLE_AIDS] = -kp * angles - kd * angvels
 
 
 # ----------------------------
@@ -100,43 +114,44 @@ mujoco.mj_forward(model, data)
 # ----------------------------
 # RUN SIMULATION
 # ----------------------------
+
+def balance_control(model, data):
+    data.ctrl[:] = 0.0
+
+    ankle_balance_control(model, data)
+    hip_balance_control(model, data)
+
+
+STEPS_PER_SYNC = 10  # physics steps between viewer syncs
+DEBUG_EVERY = 50
+
 step = 0
 
 with mujoco.viewer.launch_passive(model, data) as viewer:
     while viewer.is_running():
-        data.ctrl[:] = 0.0
-
-        ankle_balance_control(model, data)
-        hip_balance_control(model, data)
-
-        if step % 50 == 0:
-            print("\n=== STEP", step, "===")
-            print("torso angle:", data.qpos[torso_qadr])
-            print("torso angvel:", data.qvel[torso_vadr])
-            print("root quat:", data.qpos[3:7])
-            print("num contacts:", data.ncon)
-            for i in range(data.ncon):
-                c = data.contact[i]
-                g1 = mujoco.mj_id2name(model, mujoco.mjtObj.mjOBJ_GEOM, c.geom1)
-                g2 = mujoco.mj_id2name(model, mujoco.mjtObj.mjOBJ_GEOM, c.geom2)
-                print(f"contact {i}: {g1} <-> {g2}")
-
-            for side in ("right", "left"):
-                aid = mujoco.mj_name2id(
-                    model, mujoco.mjtObj.mjOBJ_ACTUATOR, f"hip_y_{side}"
-                )
-                print(f"hip_y_{side} ctrl:", data.ctrl[aid])
-
-                aid = mujoco.mj_name2id(
-                    model, mujoco.mjtObj.mjOBJ_ACTUATOR, f"ankle_x_{side}"
-                )
-                print(f"ankle_x_{side} ctrl:", data.ctrl[aid])
-            for foot in ("foot_right", "foot_left"):
-                bid = mujoco.mj_name2id(model, mujoco.mjtObj.mjOBJ_BODY, foot)
-                linvel = data.cvel[6 * bid + 3:6 * bid + 6]
-                print(f"{foot} linvel:", linvel)
-
-        mujoco.mj_step(model, data)
-        viewer.sync()
-        step += 1
+        # ctrl is recomputed from the current state before every physics step;
+        # only the viewer sync is batched
+        for _ in range(STEPS_PER_SYNC):
+            balance_control(model, data)
+
+            if step % DEBUG_EVERY == 0:
+                print("\n=== STEP", step, "===")
+                print("torso angle:", data.qpos[torso_qadr])
+                print("torso angvel:", data.qvel[torso_vadr])
+                print("root quat:", data.qpos[3:7])
+                print("num contacts:", data.ncon)
+                for i in range(data.ncon):
+                    c = data.contact[i]
+                    print(f"contact {i}: {GEOM_NAMES[c.geom1]} <-> {GEOM_NAMES[c.geom2]}")
+
+                for side, hip_aid, ankle_aid in zip(SIDES, HIP_AIDS, ANKLE_AIDS):
+                    print(f"hip_y_{side} ctrl:", data.ctrl[hip_aid])
+                    print(f"ankle_x_{side} ctrl:", data.ctrl[ankle_aid])
+                for foot, bid in FOOT_BIDS.items():
+                    linvel = data.cvel[6 * bid + 3:6 * bid + 6]
+                    print(f"{foot} linvel:", linvel)
+
+            mujoco.mj_step(model, data)
+            step += 1
 
+        viewer.sync()
@@ -1,7 +1,6 @@
 import mujoco
 import mujoco.viewer
 import numpy as np
-import time
 
 model = mujoco.MjModel.from_xml_path("humanoid.xml")
 data  = mujoco.MjData(model)
@@ -24,6 +23,11 @@ mujoco.mj_forward(model, data)
 
 target_qpos = data.qpos.copy()
 
+# Actuator i drives joint actuator_trnid[i, 0]; the target pose is static,
+# so the per-actuator position targets can be gathered once.
+CTRL_QADR = model.jnt_qposadr[model.actuator_trnid[:, 0]].astype(np.intp)
+CTRL_TARGETS = target_qpos[CTRL_QADR].copy()
+
 # -------------------------------------------------
 # DEBUG: ACTUATOR MAP (ONCE)
 # -------------------------------------------------
@@ -39,35 +43,35 @@ print("===========================\n")
 # COM COMPUTATION (MuJoCo 3.x)
 # -------------------------------------------------
 
+# zero-mass bodies (worldbody) contribute nothing to either sum
+TOTAL_MASS = model.body_mass.sum()
+
 def compute_com(model, data):
-    total_mass = 0.0
-    com = np.zeros(3)
-    for i in range(model.nbody):
-        m = model.body_mass[i]
-        if m > 0:
-            com += m * data.xipos[i]
-            total_mass += m
-    return com / total_mass
+    return (model.body_mass[:, None] * data.xipos).sum(axis=0) / TOTAL_MASS
 
 # -------------------------------------------------
 # SIM LOOP WITH DEBUG PRINTS
 # -------------------------------------------------
 
+# ctrl is constant, so several steps can run in one mj_step call
+# between viewer syncs (~50 Hz of sim time)
+STEPS_PER_SYNC = max(1, round(0.02 / model.opt.timestep))
+
+# debug print every 0.5 s of sim time, scheduled by step count
+PRINT_EVERY = round(0.5 / model.opt.timestep)
+
 step = 0
-last_print = time.time()
+next_print = 0
 
 with mujoco.viewer.launch_passive(model, data) as viewer:
     while viewer.is_running():
         # Position control
-        for i in range(model.nu):
-            j_id = model.actuator_trnid[i][0]
-            qadr = model.jnt_qposadr[j_id]
-            data.ctrl[i] = target_qpos[qadr]
+        data.ctrl[:] = CTRL_TARGETS
 
-        mujoco.mj_step(model, data)
+        mujoco.mj_step(model, data, nstep=STEPS_PER_SYNC)
 
-        if time.time() - last_print > 0.5:
-            last_print = time.time()
+        if step >= next_print:
+            next_print += PRINT_EVERY
 
             com = compute_com(model, data)
             knee_L = data.qpos[model.joint('knee_left').qposadr[0]]
@@ -85,5 +89,5 @@ with mujoco.viewer.launch_passive(model, data) as viewer:
                 f"ankle_R={ankle_R:.2f}"
             )
 
-        step += 1
+        step += STEPS_PER_SYNC
         viewer.sync()
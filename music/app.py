@@ -1,11 +1,16 @@
 import socket
+import struct
 import tkinter as tk
 import math
 
 UDP_IP = "127.0.0.1"
 UDP_PORT = 5005
 
+# Payload sent by monitoring.py: one little-endian float32 (Hz)
+UNPACK_PITCH = struct.Struct('<f').unpack
+
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)  # absorb bursts
 sock.bind((UDP_IP, UDP_PORT))
 sock.setblocking(False)
 
@@ -52,66 +57,114 @@ def point_to_note_name(point):
 
 current_point = 0
 
+CENTER_X = 300
+CENTER_Y = 300
+BASE_RADIUS = 30
+ACTIVE_SIZE = 8
+IDLE_SIZE = 3
 
-def draw_spiral():
-    canvas.delete("all")
-
-    center_x = 300
-    center_y = 300
-    base_radius = 30
 
-    # Draw 48 points (4 octaves × 12 notes) on a true spiral
+def spiral_points():
+    """Positions of the 48 points (4 octaves × 12 notes) on a true spiral"""
+    points = []
     for i in range(48):
         # Spiral parameters: radius grows continuously, angle increases continuously
         # After each full rotation (12 notes), radius doubles
         angle = (i / 12) * 2 * math.pi - math.pi / 2
-        radius = base_radius * (2 ** (i / 12))
+        radius = BASE_RADIUS * (2 ** (i / 12))
+
+        points.append((CENTER_X + radius * math.cos(angle),
+                       CENTER_Y + radius * math.sin(angle)))
+    return points
+
 
-        x = center_x + radius * math.cos(angle)
-        y = center_y + radius * math.sin(angle)
+# The layout is static, so it is computed once
+SPIRAL_POINTS = spiral_points()
 
-        # Highlight current point
-        is_active = (i == current_point)
-        point_size = 8 if is_active else 3
-        color = "lime" if is_active else "gray30"
 
+def style_point(i, is_active):
+    x, y = SPIRAL_POINTS[i]
+    point_size = ACTIVE_SIZE if is_active else IDLE_SIZE
+    color = "lime" if is_active else "gray30"
+
+    canvas.coords(f"p{i}",
+                  x - point_size, y - point_size,
+                  x + point_size, y + point_size)
+    canvas.itemconfig(f"p{i}", fill=color, outline=color)
+
+
+def init_spiral():
+    """Create the canvas items once; draw_spiral only restyles them"""
+    for i, (x, y) in enumerate(SPIRAL_POINTS):
         canvas.create_oval(
-            x - point_size, y - point_size,
-            x + point_size, y + point_size,
-            fill=color, outline=color
+            x - IDLE_SIZE, y - IDLE_SIZE,
+            x + IDLE_SIZE, y + IDLE_SIZE,
+            fill="gray30", outline="gray30", tags=f"p{i}"
         )
 
-    # Draw note name in center
-    note_name = point_to_note_name(current_point)
+    # Note name in center
     canvas.create_text(
-        center_x, center_y,
-        text=note_name,
+        CENTER_X, CENTER_Y,
+        text="",
         fill="lime",
-        font=("Consolas", 48, "bold")
+        font=("Consolas", 48, "bold"),
+        tags="note"
     )
 
 
+drawn_point = None
+
+
+def draw_spiral():
+    global drawn_point
+
+    if drawn_point == current_point:
+        return
+
+    # Highlight current point
+    if drawn_point is not None:
+        style_point(drawn_point, False)
+    style_point(current_point, True)
+    drawn_point = current_point
+
+    canvas.itemconfig("note", text=point_to_note_name(current_point))
+
+
 def poll_socket():
     global current_point
+
+    # Drain everything queued since the last tick, keep only the newest pitch
+    last_hz = None
     try:
         while True:
             data, _ = sock.recvfrom(1024)
-            hz_str = data.decode("utf-8")
             try:
-                hz = float(hz_str)
-                current_point = hz_to_point_index(hz)
-                label.config(text=f"{hz_str} Hz")
-                draw_spiral()
-            except ValueError:
+                last_hz = UNPACK_PITCH(data[:4])[0]
+            except struct.error:
                 pass
     except BlockingIOError:
         pass
 
-    root.after(20, poll_socket)
+    if last_hz is not None:
+        current_point = hz_to_point_index(last_hz)
+        label.config(text=f"{last_hz:.2f} Hz")
+        draw_spiral()
+
+
+def poll_socket_periodic():
+    poll_socket()
+    root.after(20, poll_socket_periodic)
 
 
 # Initial draw
+init_spiral()
 draw_spiral()
-poll_socket()
+
+if hasattr(root.tk, "createfilehandler"):
+    # Linux / macOS: Tk wakes us only when a packet is waiting
+    root.tk.createfilehandler(sock, tk.READABLE, lambda *_: poll_socket())
+else:
+    # Windows Tk has no file handlers, fall back to polling at 50 Hz
+    poll_socket_periodic()
 
 root.mainloop()
\ No newline at end of file
@@ -1,16 +1,25 @@
+import atexit
 import socket
+import struct
 import sounddevice as sd
 import numpy as np
 import datetime
 import os
-import time
 import queue
+import threading
 import math
 import crepe
-import contextlib
+from crepe.core import build_and_load_model, to_viterbi_cents
+import functools
 import sys
-import io
 from scipy import signal
+from scipy.ndimage import uniform_filter1d
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; fall back to a vectorized NumPy version
+    HAVE_NUMBA = False
 
 
 # ---------------- CONFIG ----------------
@@ -31,20 +40,102 @@ NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F',
 
 MIN_NOTE_FRAMES = int(MIN_NOTE_MS / STEP_MS)
 
+MODEL_CAPACITY = "small"
+CREPE_FRAME = 1024      # samples per CREPE input frame at model_srate
+
+SILENCE_RMS = 1e-4      # skip CREPE on buffers quieter than this
+RING_SLOTS = 8          # audio blocks the consumer may fall behind by
+
+PACK_PITCH = struct.Struct('<f').pack  # UDP payload: one little-endian float32
+
 
 CHOICE = '6'
 
 # ---------------- HELPERS ----------------
 
-def preprocess_audio(audio_np, rate):
-    # High-pass filter at 80 Hz to remove bass rumble
-    sos = signal.butter(4, 80, 'hp', fs=rate, output='sos')
-    return signal.sosfilt(sos, audio_np)
-
-def hz_to_note(freq_hz):
-    if freq_hz <= 0:
-        return None
-    midi = round(69 + 12 * math.log2(freq_hz / 440.0))
+@functools.lru_cache(maxsize=None)
+def highpass_sos(rate):
+    # High-pass filter at 80 Hz to remove bass rumble (designed once per rate)
+    return signal.butter(4, 80, 'hp', fs=rate, output='sos')
+
+def preprocess_audio(audio_np, rate, zi):
+    # zi carries the filter state across consecutive buffers
+    return signal.sosfilt(highpass_sos(rate), audio_np, zi=zi)
+
+def crepe_frames(audio_np, rate):
+    """
+    Same framing crepe.predict does internally: resample to the model rate,
+    then centred 1024-sample frames every STEP_MS, each normalised.
+    """
+    g = math.gcd(crepe.core.model_srate, rate)
+    audio = signal.resample_poly(audio_np, crepe.core.model_srate // g, rate // g)
+    audio = np.pad(audio.astype(np.float32), CREPE_FRAME // 2)
+
+    hop = int(crepe.core.model_srate * STEP_MS / 1000)
+    frames = np.lib.stride_tricks.sliding_window_view(audio, CREPE_FRAME)[::hop]
+
+    frames = frames - frames.mean(axis=1, keepdims=True)
+    frames /= np.clip(frames.std(axis=1, keepdims=True), 1e-8, None)
+    return frames
+
+if HAVE_NUMBA:
+    @njit(cache=True)
+    def note_onsets(midi, min_frames, current_midi, current_count, locked):
+        """
+        Run per-frame MIDI numbers through the stable-note state machine.
+        Returns the frame indices where a note is emitted plus the new state,
+        so a note can carry over from one buffer into the next.
+        """
+        onsets = np.empty(len(midi), dtype=np.int64)
+        n = 0
+        for i in range(len(midi)):
+            m = midi[i]
+
+            # same note → count
+            if m == current_midi:
+                current_count += 1
+            else:
+                # note changed → unlock and restart count
+                current_midi = m
+                current_count = 1
+                locked = False
+
+            # emit ONCE per note region
+            if not locked and current_count >= min_frames:
+                locked = True
+                onsets[n] = i
+                n += 1
+
+        return onsets[:n], current_midi, current_count, locked
+else:
+    def note_onsets(midi, min_frames, current_midi, current_count, locked):
+        """
+        Same state machine as the numba version, one NumPy pass per buffer:
+        only the first run can continue the previous buffer's note, every
+        other run starts unlocked from zero.
+        """
+        if len(midi) == 0:
+            return np.empty(0, dtype=np.int64), current_midi, current_count, locked
+
+        starts = np.flatnonzero(np.concatenate(([True], midi[1:] != midi[:-1])))
+        lengths = np.diff(np.append(starts, len(midi)))
+
+        count_before = np.zeros(len(starts), dtype=np.int64)
+        was_locked = np.zeros(len(starts), dtype=bool)
+        if midi[0] == current_midi:
+            count_before[0] = current_count
+            was_locked[0] = locked
+
+        counts = count_before + lengths
+        emit = ~was_locked & (counts >= min_frames)
+
+        # frame at which each emitting run reaches min_frames
+        onsets = starts + np.maximum(min_frames - count_before, 1) - 1
+
+        return (onsets[emit], int(midi[-1]), int(counts[-1]),
+                bool(was_locked[-1] or emit[-1]))
+
+def midi_to_note(midi):
     name = NOTE_NAMES[midi % 12]
     octave = midi // 12 - 1
     return f"{name}{octave}"
@@ -56,30 +147,65 @@ class AudioMonitor:
         self.RATE = 44100
         self.CHUNK = 4096
 
-        self.audio_queue = queue.Queue()
-        self.audio_buffer = []
+        # The PortAudio callback mixes each block to mono into a preallocated
+        # ring slot and only passes the slot index through the queue.
+        self.audio_queue = queue.SimpleQueue()
+        self.ring = np.empty((RING_SLOTS, self.CHUNK), dtype=np.float32)
+        self.ring_write = 0  # blocks written by the callback
+        self.ring_read = 0   # blocks the consumer has finished copying out
+        self.ring_dropped = 0   # bumped by the callback, reported by the consumer
+        self.reported_dropped = 0
 
         self.buffer_seconds = BUFFER_SECONDS
+
+        # preallocated analysis buffer: never holds more than one window + one chunk
+        self.audio_buffer = np.empty(
+            int(self.buffer_seconds * self.RATE) + self.CHUNK, dtype=np.float32
+        )
+        self.buffered_samples = 0
+        self.hp_zi = signal.sosfilt_zi(highpass_sos(self.RATE)) * 0.0
         self.last_emitted_note = None
 
         self.log_file = log_file
-        open(self.log_file, 'w').close()
+        self._log_f = open(self.log_file, 'w')
+
+        # disk writes happen on a background thread, off the audio path
+        self._log_q = queue.SimpleQueue()
+        self._log_thread = threading.Thread(target=self._log_worker, daemon=True)
+        self._log_thread.start()
+        atexit.register(self.close_log)
 
         # UDP
         self.UDP_IP = "127.0.0.1"
         self.UDP_PORT = 5005
         self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
-        self.current_note = None
+        self.current_midi = -1  # no note yet
         self.current_count = 0
 
         self.note_locked = False
 
+        # load CREPE once instead of going through crepe.predict per buffer
+        self._crepe_model = build_and_load_model(MODEL_CAPACITY)
+
+    # ---------- PITCH ----------
+
+    def run_crepe(self, audio_np):
+        """Pitch + confidence per frame, calling the cached Keras model directly"""
+        frames = crepe_frames(audio_np, self.RATE)
+        activation = self._crepe_model.predict(frames, verbose=0)
+
+        confidence = activation.max(axis=1)
+        cents = to_viterbi_cents(activation)
+        frequency = 10 * 2 ** (cents / 1200)
+        frequency[np.isnan(frequency)] = 0
+        return frequency, confidence
+
     # ---------- I/O ----------
 
     def send_pitch_udp(self, pitch):
         try:
-            self.udp_sock.sendto(f"{pitch:.2f}".encode(),
+            self.udp_sock.sendto(PACK_PITCH(float(pitch)),
                                  (self.UDP_IP, self.UDP_PORT))
         except Exception:
             pass
@@ -88,8 +214,24 @@ class AudioMonitor:
         ts = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         line = f"[{ts}] Pitch: {pitch:8.2f} Hz | Note: {note}\n"
         print(line.strip())
-        with open(self.log_file, "a") as f:
-            f.write(line)
+        self._log_q.put(line)
+
+    def _log_worker(self):
+        # the worker owns the file: it is only closed here, after the sentinel
+        with self._log_f:
+            while True:
+                line = self._log_q.get()
+                if line is None:
+                    break
+                self._log_f.write(line)
+
+                # flush once the backlog is drained
+                if self._log_q.empty():
+                    self._log_f.flush()
+
+    def close_log(self):
+        self._log_q.put(None)
+        self._log_thread.join(timeout=1)
 
     # ---------- DEVICE SELECTION ----------
 
@@ -130,7 +272,22 @@ class AudioMonitor:
     def audio_callback(self, indata, frames, time_info, status):
         if status:
             print(status)
-        self.audio_queue.put(indata.copy())
+
+        # every slot still unread → drop this block rather than overwrite one
+        if self.ring_write - self.ring_read >= RING_SLOTS:
+            self.ring_dropped += 1
+            return
+
+        idx = self.ring_write % RING_SLOTS
+        slot = self.ring[idx, :frames]
+        if indata.shape[1] > 1:
+            np.add(indata[:, 0], indata[:, 1], out=slot)
+            slot *= 0.5
+        else:
+            np.copyto(slot, indata[:, 0])
+
+        self.ring_write += 1
+        self.audio_queue.put((idx, frames))
 
     # ---------- MAIN LOOP ----------
 
@@ -153,79 +310,73 @@ class AudioMonitor:
         ):
             while True:
                 try:
-                    audio = self.audio_queue.get(timeout=1)
-
-                    if audio.ndim > 1:
-                        audio = audio.mean(axis=1)
+                    idx, frames = self.audio_queue.get(timeout=1)
+                    audio = self.ring[idx, :frames]
+
+                    end = self.buffered_samples + len(audio)
+                    self.audio_buffer[self.buffered_samples:end] = audio
+                    self.buffered_samples = end
+                    self.ring_read += 1  # slot copied out, callback may reuse it
+
+                    dropped = self.ring_dropped
+                    if dropped != self.reported_dropped:
+                        print(f"[WARN] analysis fell behind, dropped "
+                              f"{dropped - self.reported_dropped} audio block(s) "
+                              f"({dropped} so far)")
+                        self.reported_dropped = dropped
+
+                    if self.buffered_samples / self.RATE < self.buffer_seconds:
+                        continue
 
-                    self.audio_buffer.append(audio)
+                    audio_np, self.hp_zi = preprocess_audio(
+                        self.audio_buffer[:self.buffered_samples],
+                        self.RATE, self.hp_zi
+                    )
+                    self.buffered_samples = 0
 
-                    total_samples = sum(len(x) for x in self.audio_buffer)
-                    if total_samples / self.RATE < self.buffer_seconds:
+                    # silent buffer → nothing for CREPE to find
+                    rms = math.sqrt(np.dot(audio_np, audio_np) / len(audio_np))
+                    if rms < SILENCE_RMS:
                         continue
 
-                    audio_np = np.concatenate(self.audio_buffer).astype(np.float32)
-                    audio_np = preprocess_audio(audio_np, self.RATE)
-                    self.audio_buffer = []
-
                     # -------- CREPE --------
 
-                    with contextlib.redirect_stdout(io.StringIO()):
-                        _, frequency, confidence, _ = crepe.predict(
-                            audio_np,
-                            self.RATE,
-                            step_size=STEP_MS,
-                            viterbi=True,
-                            model_capacity="small"
-                        )
+                    frequency, confidence = self.run_crepe(audio_np)
 
                     frequency[confidence < CONF_THRESHOLD] = np.nan
 
-                    kernel = np.ones(SMOOTH_FRAMES)
                     valid = np.isfinite(frequency).astype(float)
                     freq_filled = np.nan_to_num(frequency, nan=0.0)
 
-                    smoothed = np.convolve(freq_filled, kernel, mode="same") / \
-                               np.maximum(np.convolve(valid, kernel, mode="same"), 1e-9)
+                    # moving averages; the 1/SMOOTH_FRAMES factors cancel
+                    smoothed = uniform_filter1d(freq_filled, SMOOTH_FRAMES, mode="constant") / \
+                               np.maximum(uniform_filter1d(valid, SMOOTH_FRAMES, mode="constant"), 1e-9)
 
-                    for f in smoothed:
-                        if not np.isfinite(f) or f <= 0:
-                            continue
-
-                        note = hz_to_note(float(f))
-
-                        # reset if silence or invalid
-                        if note is None:
-                            self.current_note = None
-                            self.current_count = 0
-                            self.note_locked = False
-                            continue
+                    # silent / invalid frames are skipped, they don't break a note
+                    pitched = smoothed[np.isfinite(smoothed) & (smoothed > 0)]
+                    if pitched.size == 0:
+                        continue
 
-                        # same note → count
-                        if note == self.current_note:
-                            self.current_count += 1
-                        else:
-                            # note changed → unlock and restart count
-                            self.current_note = note
-                            self.current_count = 1
-                            self.note_locked = False
+                    midi = np.rint(69 + 12 * np.log2(pitched / 440.0)).astype(np.int64)
 
-                        # emit ONCE per note region
-                        if (
-                                not self.note_locked and
-                                self.current_count >= MIN_NOTE_FRAMES
-                        ):
-                            self.note_locked = True
-                            self.last_emitted_note = note
-                            self.log_data(f, note)
-                            self.send_pitch_udp(f)
+                    onsets, self.current_midi, self.current_count, self.note_locked = \
+                        note_onsets(midi, MIN_NOTE_FRAMES, self.current_midi,
+                                    self.current_count, self.note_locked)
 
+                    for i in onsets:
+                        f = pitched[i]
+                        note = midi_to_note(int(midi[i]))
 
+                        self.last_emitted_note = note
+                        self.log_data(f, note)
+                        self.send_pitch_udp(f)
 
                 except queue.Empty:
                     continue
                 except KeyboardInterrupt:
                     print("\nStopped.")
+                    if self.ring_dropped:
+                        print(f"[WARN] {self.ring_dropped} audio block(s) dropped in total")
                     return
 
 
@@ -24,12 +24,19 @@ def note_to_freq(note):
     semitones = NOTE_OFFSETS[name] + (octave - 4) * 12
     return int(440 * (2 ** (semitones / 12)))
 
+# Every playable note, computed once
+NOTE_FREQ = {
+    f"{name}{octave}": note_to_freq(f"{name}{octave}")
+    for name in NOTE_OFFSETS
+    for octave in range(10)  # every single-digit octave note_to_freq parses
+}
+
 def play_melody(melody):
     for token in melody.split():
         if token == "_":
             time.sleep(NOTE_DURATION / 1000)
         else:
-            freq = note_to_freq(token)
+            freq = NOTE_FREQ[token]
             winsound.Beep(freq, NOTE_DURATION)
             time.sleep(PAUSE / 1000)
 
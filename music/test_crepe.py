@@ -1,10 +1,11 @@
+import os
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")  # quiet TF start-up logging
+
 import crepe
 import soundfile as sf
 import numpy as np
 import pretty_midi
 
-import math
-
 NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F',
               'F#', 'G', 'G#', 'A', 'A#', 'B']
 
@@ -12,7 +13,9 @@ NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F',
 # ---- tuning knobs ----
 CONF_THRESHOLD = 0.80     # ignore uncertain frames
 SMOOTH_MS = 60            # smoothing window in milliseconds
-STEP_MS = 10              # must match step_size above
+STEP_MS = 10              # crepe.predict step_size
+SILENCE_RMS = 0.01        # frames quieter than this skip CREPE entirely
+CREPE_WINDOW_S = 0.064    # CREPE analysis window (1024 samples at 16 kHz)
 SMOOTH_FRAMES = max(1, int(round(SMOOTH_MS / STEP_MS)))
 
 
@@ -23,148 +26,130 @@ MIN_GAP = 0.01  # seconds (10 ms silence between notes)
 MIN_MIDI_NOTE_MS = 200  # must be >= MIN_NOTE_MS
 MIN_MIDI_NOTE_S = MIN_MIDI_NOTE_MS / 1000.0
 
-audio, sr = sf.read("data/greensleeves.wav")
+audio, sr = sf.read("data/greensleeves.wav", dtype="float32")
 
 
 if audio.ndim > 1:
-    audio = np.mean(audio, axis=1)
-
-time, frequency, confidence, _ = crepe.predict(
-    audio,
-    sr,
-    step_size=10,      # ms
-    viterbi=False,
-    model_capacity="small"
-)
+    # mix down in float32 (np.mean would upcast to float64)
+    mono = audio[:, 0].copy()
+    for ch in range(1, audio.shape[1]):
+        mono += audio[:, ch]
+    mono *= 1.0 / audio.shape[1]
+    audio = mono
+
+# MIDI number → note name, e.g. 69 → "A4"
+NOTE_NAME_TABLE = [f"{NOTE_NAMES[m % 12]}{m // 12 - 1}" for m in range(128)]
+
+
+def runs(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Start index and length of each run of equal values"""
+    starts = np.flatnonzero(np.diff(values, prepend=values[:1] - 1))
+    lengths = np.diff(np.append(starts, len(values)))
+    return starts, lengths
+
+
+# 0) skip silence: CREPE only sees spans whose frame energy is above the gate.
+# frames sit on the same 10 ms grid crepe.predict uses (frame i centred at i * hop)
+hop = sr * STEP_MS / 1000.0
+win = int(round(sr * CREPE_WINDOW_S))
+n_frames = int(len(audio) / hop) + 1
+
+centres = np.rint(np.arange(n_frames) * hop).astype(np.int64)
+lo = np.clip(centres - win // 2, 0, len(audio))
+hi = np.clip(centres + win // 2, 0, len(audio))
+energy = np.concatenate(([0.0], np.cumsum(np.square(audio, dtype=np.float64))))
+frame_rms = np.sqrt((energy[hi] - energy[lo]) / win)
+
+time = np.arange(n_frames) * (STEP_MS / 1000.0)
+frequency = np.full(n_frames, np.nan)
+confidence = np.zeros(n_frames)   # silent frames fall below CONF_THRESHOLD
+
+span_starts, span_lengths = runs((frame_rms > SILENCE_RMS).astype(np.int8))
+for start, length in zip(span_starts, span_lengths):
+    if frame_rms[start] <= SILENCE_RMS:
+        continue
 
+    segment = audio[centres[start]:int(round((start + length) * hop))]
+    _, seg_freq, seg_conf, _ = crepe.predict(
+        segment,
+        sr,
+        step_size=STEP_MS,
+        viterbi=False,
+        model_capacity="tiny",   # low-confidence frames are dropped anyway
+        verbose=0          # no per-batch Keras progress bar
+    )
 
-def hz_to_note(freq_hz: float) -> str | None:
-    if freq_hz <= 0:
-        return None
-    midi = round(69 + 12 * math.log2(freq_hz / 440.0))
-    name = NOTE_NAMES[midi % 12]
-    octave = midi // 12 - 1
-    return f"{name}{octave}"
+    n = min(length, len(seg_freq))
+    frequency[start:start + n] = seg_freq[:n]
+    confidence[start:start + n] = seg_conf[:n]
 
 # 1) drop low-confidence frames
 freq = frequency.copy()
 freq[confidence < CONF_THRESHOLD] = np.nan
 
 # 2) smooth using moving average (ignoring NaNs)
-kernel = np.ones(SMOOTH_FRAMES, dtype=float)
+def boxcar_sum(a, k):
+    """Centred moving sum, aligned like np.convolve(a, np.ones(k), mode="same"), in O(n)"""
+    a = np.pad(a, (k // 2, (k - 1) // 2))
+    c = np.concatenate(([0.0], np.cumsum(a, dtype=np.float64)))
+    return c[k:] - c[:-k]
+
 valid = np.isfinite(freq).astype(float)
 freq_filled = np.nan_to_num(freq, nan=0.0)
 
-smoothed = np.convolve(freq_filled, kernel, mode="same") / np.maximum(
-    np.convolve(valid, kernel, mode="same"), 1e-9
+smoothed = boxcar_sum(freq_filled, SMOOTH_FRAMES) / np.maximum(
+    boxcar_sum(valid, SMOOTH_FRAMES), 1e-9
 )
 
 # 3) turn smoothed pitch into a stable note stream (print only changes)
-current_note = None
-current_count = 0
-
-for t, f in zip(time, smoothed):
-    if not np.isfinite(f) or f <= 0:
-        current_note = None
-        current_count = 0
-        continue
-
-    note = hz_to_note(float(f))
-    if note is None:
-        continue
+# per-frame MIDI number, -1 where there is no pitch
+pitched = np.isfinite(smoothed) & (smoothed > 0)
+with np.errstate(invalid="ignore", divide="ignore"):
+    midi_frames = np.where(
+        pitched, np.rint(69 + 12 * np.log2(smoothed / 440.0)), -1
+    ).astype(np.int64)
 
-    if note == current_note:
-        current_count += 1
-    else:
-        current_note = note
-        current_count = 1
+# accept note only if it was stable long enough (silence breaks a run)
+starts, lengths = runs(midi_frames)
+stable = starts[(lengths >= MIN_NOTE_FRAMES) & (midi_frames[starts] >= 0)]
 
-    # accept note only if it was stable long enough
-    if current_count == MIN_NOTE_FRAMES:
-        print(f"{t:.3f}s  {note}")
+for i in stable:
+    print(f"{time[i + MIN_NOTE_FRAMES - 1]:.3f}s  {NOTE_NAME_TABLE[midi_frames[i]]}")
 
 # ---------------- MIDI GENERATION ----------------
 
 midi = pretty_midi.PrettyMIDI()
 instrument = pretty_midi.Instrument(program=pretty_midi.instrument_name_to_program("Acoustic Grand Piano"))
 
-NOTE_TO_MIDI = {
-    'C': 0, 'C#': 1, 'D': 2, 'D#': 3, 'E': 4,
-    'F': 5, 'F#': 6, 'G': 7, 'G#': 8,
-    'A': 9, 'A#': 10, 'B': 11
-}
-
-def note_name_to_midi(note: str) -> int:
-    name = note[:-1]
-    octave = int(note[-1])
-    return 12 * (octave + 1) + NOTE_TO_MIDI[name]
-
-# rebuild the same stable-note logic, but store times
-events = []
-
-current_note = None
-current_start = None
-current_count = 0
-
-for t, f in zip(time, smoothed):
-    if not np.isfinite(f) or f <= 0:
-        # IMPORTANT: do NOT close the note yet
-        current_count = 0
-        continue
-
-    note = hz_to_note(float(f))
-    if note is None:
-        continue
-
-    if note == current_note:
-        current_count += 1
-    else:
-        # note changed → close previous note
-        if current_note is not None:
-            events.append((current_note, current_start, t))
-
-        current_note = note
-        current_start = t
-        current_count = 1
-
-# flush last note
-if current_note is not None:
-    events.append((current_note, current_start, time[-1]))
+# rebuild the same stable-note logic, but store times.
+# silence does NOT close a note, so runs are taken over pitched frames only;
+# a note ends where the next one starts (or at the end of the audio)
+pitched_time = time[pitched]
+pitched_midi = midi_frames[pitched]
 
+starts, _ = runs(pitched_midi)
+event_start = pitched_time[starts]
+event_end = np.append(pitched_time[starts[1:]], time[-1])
 
 # ---- remove ultra-short ghost notes ----
 
-events = [
-    (note, start, end)
-    for note, start, end in events
-    if end - start >= MIN_MIDI_NOTE_S
-]
+keep = event_end - event_start >= MIN_MIDI_NOTE_S
 
+# (midi number, start, end) – the MIDI number is kept as is, no name round-trip
+event_midi = pitched_midi[starts][keep].tolist()
+event_start = event_start[keep].tolist()
+event_end = event_end[keep].tolist()
 
+# write MIDI notes, forcing strict legato: each note ends where the next starts
+note_ends = event_start[1:] + event_end[-1:]
 
-# write MIDI notes
-prev_end = None
-
-instrument.notes = []
-
-for i, (note, start, end) in enumerate(events):
-    # force strict legato: end = next start
-    if i + 1 < len(events):
-        end = events[i + 1][1]
-
-    midi_note = note_name_to_midi(note)
-
-    instrument.notes.append(
-        pretty_midi.Note(
-            velocity=90,
-            pitch=midi_note,
-            start=float(start),
-            end=float(end)
-        )
-    )
+instrument.notes = [
+    pretty_midi.Note(velocity=90, pitch=midi_note, start=start, end=end)
+    for midi_note, start, end in zip(event_midi, event_start, note_ends)
+]
 
 midi.instruments.append(instrument)
 
-os.mkdirs("output", exist_ok=True)
+os.makedirs("output", exist_ok=True)
 midi.write("output/output_crepe.mid")
 
@@ -9,8 +9,14 @@ from pathlib import Path
 # ---------- CONFIG ----------
 SUMO_CFG = r"C:\Users\Yugen\sumo\manhattan\data\manhattan.sumocfg"
 LOG_DIR = Path(r"C:\Users\Yugen\sumo\manhattan\logs")
-MAX_FILES = 100
+# Logs rotate by size, not per step: at most MAX_LOG_FILES files of
+# ROWS_PER_FILE vehicle rows each are kept (~10M rows on disk with the
+# defaults). The old per-step layout kept the last 100 steps instead.
+MAX_LOG_FILES = 100
+ROWS_PER_FILE = 100_000
 STEP_DELAY = 0.03
+# Eye-friendly pacing in sumo-gui is opt-in: SUMO_VISUAL_DELAY=1
+VISUAL_DELAY = os.environ.get("SUMO_VISUAL_DELAY", "0") == "1"
 # ----------------------------
 
 assert os.path.exists(SUMO_CFG)
@@ -27,55 +33,80 @@ traci.start([
     "--start"
 ])
 
-def rotate_logs():
-    files = sorted(LOG_DIR.glob("step_*.csv"))
-    while len(files) >= MAX_FILES:
-        files[0].unlink()
-        files.pop(0)
-
-step_idx = 0
-
-while traci.simulation.getMinExpectedNumber() > 0:
-    traci.simulationStep()
-    sim_time = traci.simulation.getTime()
-
-    # Rotate old files
-    rotate_logs()
-
-    # Write one CSV for this timestep
-    csv_path = LOG_DIR / f"step_{step_idx:06d}.csv"
-
-    with open(csv_path, "w", newline="", encoding="utf8") as f:
-        writer = csv.writer(f)
-        writer.writerow([
-            "time",
-            "vehicle_id",
-            "vehicle_type",
-            "route_id",
-            "x",
-            "y",
-            "speed",
-            "accel",
-            "lane_id",
-            "edge_id"
-        ])
-
-        for vid in traci.vehicle.getIDList():
-            x, y = traci.vehicle.getPosition(vid)
-            writer.writerow([
+CSV_HEADER = [
+    "time",
+    "vehicle_id",
+    "vehicle_type",
+    "route_id",
+    "x",
+    "y",
+    "speed",
+    "accel",
+    "lane_id",
+    "edge_id"
+]
+
+
+def open_log(file_idx):
+    """Start CSV file number file_idx, dropping the one MAX_LOG_FILES back"""
+    # names are sequential, so the oldest file is known without listing LOG_DIR
+    if file_idx >= MAX_LOG_FILES:
+        (LOG_DIR / f"steps_{file_idx - MAX_LOG_FILES:06d}.csv").unlink(missing_ok=True)
+
+    f = open(LOG_DIR / f"steps_{file_idx:06d}.csv", "w",
+             newline="", encoding="utf8", buffering=1 << 20)
+    writer = csv.writer(f)
+    writer.writerow(CSV_HEADER)
+    return f, writer
+
+
+file_idx = 0
+file_rows = 0
+
+f, writer = open_log(file_idx)
+
+# Bind the per-vehicle getters once; the loop below calls them for every vehicle
+get_ids = traci.vehicle.getIDList
+get_type = traci.vehicle.getTypeID
+get_route = traci.vehicle.getRouteID
+get_pos = traci.vehicle.getPosition
+get_speed = traci.vehicle.getSpeed
+get_accel = traci.vehicle.getAcceleration
+get_lane = traci.vehicle.getLaneID
+get_road = traci.vehicle.getRoadID
+
+try:
+    while traci.simulation.getMinExpectedNumber() > 0:
+        traci.simulationStep()
+        sim_time = traci.simulation.getTime()
+
+        writerow = writer.writerow
+        for vid in get_ids():
+            x, y = get_pos(vid)
+            writerow([
                 sim_time,
                 vid,
-                traci.vehicle.getTypeID(vid),
-                traci.vehicle.getRouteID(vid),
+                get_type(vid),
+                get_route(vid),
                 x,
                 y,
-                traci.vehicle.getSpeed(vid),
-                traci.vehicle.getAcceleration(vid),
-                traci.vehicle.getLaneID(vid),
-                traci.vehicle.getRoadID(vid)
+                get_speed(vid),
+                get_accel(vid),
+                get_lane(vid),
+                get_road(vid)
             ])
-
-    step_idx += 1
-    time.sleep(STEP_DELAY)
+            file_rows += 1
+
+        # Rotate once the current file is full (steps never span two files)
+        if file_rows >= ROWS_PER_FILE:
+            f.close()
+            file_idx += 1
+            file_rows = 0
+            f, writer = open_log(file_idx)
+
+        if VISUAL_DELAY and STEP_DELAY > 0:
+            time.sleep(STEP_DELAY)
+finally:
+    f.close()
 
 traci.close()
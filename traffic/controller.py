@@ -6,17 +6,37 @@ Traffic Light Controller with JSON Configuration
 A simple adaptive traffic light controller that loads parameters from JSON config files.
 
 Usage:
-    python controller.py [config_file.json]
+    python controller.py [config_file.json ...]
 
-If no config file specified, defaults to configs/adaptive_config.json
+If no config file specified, defaults to configs/adaptive_config.json.
+Several config files are run in parallel, one SUMO instance per process.
 """
 
 import sys
 import os
+import gzip
 import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson  # optional, much faster log serialization
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
 USE_GUI = True
 
 # Add SUMO tools to path
@@ -26,52 +46,113 @@ if 'SUMO_HOME' in os.environ:
 else:
     sys.exit("Please set SUMO_HOME environment variable")
 
-import traci
+if USE_GUI:
+    import traci
+else:
+    # headless: libsumo runs SUMO in-process with the same API, so every call
+    # is a function call instead of a socket round-trip
+    try:
+        import libsumo as traci
+    except ImportError:
+        import traci
+import traci.constants as tc
+
+# Variables fetched via TraCI subscriptions: SUMO sends them all in the
+# simulationStep reply instead of one round-trip per getter call.
+VEHICLE_VARS = (
+    tc.VAR_POSITION,
+    tc.VAR_SPEED,
+    tc.VAR_WAITING_TIME,
+    tc.VAR_LANE_ID,
+    tc.VAR_ROAD_ID,
+)
+LANE_VARS = (
+    tc.LAST_STEP_VEHICLE_HALTING_NUMBER,
+)
+TL_VARS = (
+    tc.TL_CURRENT_PHASE,
+)
 
 # =======================
 # CONFIGURATION
 # =======================
 
+@dataclass(frozen=True, slots=True)
 class Config:
     """Simulation and controller configuration loaded from JSON"""
 
-    def __init__(self, config_path="configs/adaptive_config.json"):
+    config_path: Path
+    config_data: dict
+
+    SUMO_CFG: str
+    STEP_LENGTH: float
+    SIMULATION_STEPS: int
+    SEED: int | None
+    USE_GUI: bool
+
+    LOG_DIR: Path
+    LOG_INTERVAL: int
+    SAVE_VEHICLE_DETAILS: bool
+    COMPRESS_LOG: bool
+
+    MIN_GREEN_TIME: int
+    MAX_GREEN_TIME: int
+    YELLOW_TIME: int
+    QUEUE_THRESHOLD: int
+    WAITING_TIME_THRESHOLD: int
+
+    QUEUE_WEIGHT: float
+
+    NAME: str
+    DESCRIPTION: str
+
+    @classmethod
+    def from_json(cls, config_path="configs/adaptive_config.json"):
         """Load configuration from JSON file"""
-        self.config_path = Path(config_path)
+        config_path = Path(config_path)
 
-        if not self.config_path.exists():
+        if not config_path.exists():
             raise FileNotFoundError(f"Config file not found: {config_path}")
 
-        with open(self.config_path) as f:
+        with open(config_path) as f:
             config_data = json.load(f)
 
-        # Store original config data
-        self.config_data = config_data
-
         # Extract values with defaults
         sim = config_data.get("simulation", {})
-        self.SUMO_CFG = sim.get("sumo_config", "configs/simulation.sumocfg")
-        self.SIMULATION_STEPS = sim.get("duration_seconds", 600)
-        self.USE_GUI = USE_GUI
-
         log = config_data.get("logging", {})
-        self.LOG_DIR = Path(log.get("log_directory", "logs"))
-        self.LOG_INTERVAL = log.get("log_interval_seconds", 10)
-        self.SAVE_VEHICLE_DETAILS = log.get("save_vehicle_details", True)
-
         ctrl = config_data.get("controller", {})
-        self.MIN_GREEN_TIME = ctrl.get("min_green_time_seconds", 10)
-        self.MAX_GREEN_TIME = ctrl.get("max_green_time_seconds", 60)
-        self.YELLOW_TIME = ctrl.get("yellow_time_seconds", 3)
-        self.QUEUE_THRESHOLD = ctrl.get("queue_threshold_vehicles", 5)
-        self.WAITING_TIME_THRESHOLD = ctrl.get("waiting_time_threshold_seconds", 30)
-
         obj = config_data.get("objective", {})
-        self.QUEUE_WEIGHT = obj.get("queue_weight", 2.0)
 
-        # Config name and description
-        self.NAME = config_data.get("name", "Traffic Controller")
-        self.DESCRIPTION = config_data.get("description", "")
+        step_length = sim.get("step_length_seconds", 1.0)
+
+        return cls(
+            # Store original config data
+            config_path=config_path,
+            config_data=config_data,
+
+            SUMO_CFG=sim.get("sumo_config", "configs/simulation.sumocfg"),
+            STEP_LENGTH=step_length,
+            SIMULATION_STEPS=round(sim.get("duration_seconds", 600) / step_length),
+            SEED=sim.get("seed"),
+            USE_GUI=USE_GUI,
+
+            LOG_DIR=Path(log.get("log_directory", "logs")),
+            LOG_INTERVAL=log.get("log_interval_seconds", 10),
+            SAVE_VEHICLE_DETAILS=log.get("save_vehicle_details", True),
+            COMPRESS_LOG=log.get("compress", False),
+
+            MIN_GREEN_TIME=ctrl.get("min_green_time_seconds", 10),
+            MAX_GREEN_TIME=ctrl.get("max_green_time_seconds", 60),
+            YELLOW_TIME=ctrl.get("yellow_time_seconds", 3),
+            QUEUE_THRESHOLD=ctrl.get("queue_threshold_vehicles", 5),
+            WAITING_TIME_THRESHOLD=ctrl.get("waiting_time_threshold_seconds", 30),
+
+            QUEUE_WEIGHT=obj.get("queue_weight", 2.0),
+
+            # Config name and description
+            NAME=config_data.get("name", "Traffic Controller"),
+            DESCRIPTION=config_data.get("description", ""),
+        )
 
     def print_summary(self):
         """Print configuration summary"""
@@ -81,7 +162,8 @@ class Config:
         print(f"Description: {self.DESCRIPTION}")
         print(f"Config file: {self.config_path}")
         print(f"\nSimulation:")
-        print(f"  Duration: {self.SIMULATION_STEPS}s")
+        print(f"  Duration: {self.SIMULATION_STEPS * self.STEP_LENGTH:g}s "
+              f"({self.SIMULATION_STEPS} steps of {self.STEP_LENGTH:g}s)")
         print(f"  GUI: {'Yes' if self.USE_GUI else 'No (headless)'}")
         print(f"\nController Parameters:")
         print(f"  Min green time: {self.MIN_GREEN_TIME}s")
@@ -107,28 +189,33 @@ class TrafficMetrics:
 
     def reset(self):
         """Reset all metrics for new measurement period"""
-        self.vehicle_waiting_times = []
-        self.vehicle_speeds = []
+        # running sums/counts: only the means are ever reported
+        self.wait_sum = 0.0
+        self.wait_count = 0
+        self.speed_sum = 0.0
+        self.speed_count = 0
         self.vehicles_passed = 0
         self.total_queue_length = 0
         self.measurements = 0
 
     def update(self, waiting_times, speeds, queue_length):
-        """Update metrics with current measurements"""
-        self.vehicle_waiting_times.extend(waiting_times)
-        self.vehicle_speeds.extend(speeds)
+        """Update metrics with current measurements (NumPy arrays per vehicle)"""
+        self.wait_sum += float(waiting_times.sum())
+        self.wait_count += waiting_times.size
+        self.speed_sum += float(speeds.sum())
+        self.speed_count += speeds.size
         self.total_queue_length += queue_length
         self.measurements += 1
 
     def calculate(self):
         """Calculate aggregate metrics"""
         avg_waiting_time = (
-            sum(self.vehicle_waiting_times) / len(self.vehicle_waiting_times)
-            if self.vehicle_waiting_times else 0.0
+            self.wait_sum / self.wait_count
+            if self.wait_count else 0.0
         )
         avg_speed = (
-            sum(self.vehicle_speeds) / len(self.vehicle_speeds)
-            if self.vehicle_speeds else 0.0
+            self.speed_sum / self.speed_count
+            if self.speed_count else 0.0
         )
         avg_queue_length = (
             self.total_queue_length / self.measurements
@@ -152,43 +239,61 @@ class SimulationLogger:
 
     def __init__(self, config):
         self.config = config
-        self.log_dir = Path(config.LOG_DIR)
+        self.log_dir = config.LOG_DIR
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        config_name = Path(config.config_path).stem
-        self.log_file = self.log_dir / f"simulation_{config_name}_{timestamp}.json"
-
-        self.log_data = {
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        config_name = config.config_path.stem
+        # seed and pid keep parallel runs of same-named configs from sharing a file
+        seed_part = f"_seed{config.SEED}" if config.SEED is not None else ""
+        self.log_file = self.log_dir / f"simulation_{config_name}{seed_part}_{timestamp}_{os.getpid()}.ndjson"
+        if config.COMPRESS_LOG:
+            self.log_file = self.log_file.with_suffix(".ndjson.gz")
+
+        # Newline-delimited JSON, streamed as the run goes: a metadata line,
+        # one line per logged state, and a closing end_time line.
+        if config.COMPRESS_LOG:
+            # level 1: most of the size win for repeated keys at a fraction of the CPU
+            self._fh = gzip.open(self.log_file, 'wb', compresslevel=1)
+        else:
+            self._fh = open(self.log_file, 'wb', buffering=1 << 20)
+        self._write({
             "metadata": {
                 "start_time": datetime.now().isoformat(),
                 "config_file": str(config.config_path),
                 "config_name": config.NAME,
                 "configuration": config.config_data,
-            },
-            "states": []
-        }
+            }
+        })
+
+    def _write(self, record):
+        if orjson is not None:
+            self._fh.write(orjson.dumps(
+                record, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+            ))
+        else:
+            self._fh.write(
+                json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode() + b"\n"
+            )
 
     def log_state(self, sim_time, traffic_lights, vehicles, metrics):
         """Log current simulation state"""
         state = {
             "time": sim_time,
             "traffic_lights": traffic_lights,
-            "vehicle_count": len(vehicles),
+            "vehicle_count": len(vehicles["ids"]),
             "metrics": metrics
         }
 
         if self.config.SAVE_VEHICLE_DETAILS:
             state["vehicles"] = vehicles
 
-        self.log_data["states"].append(state)
+        self._write(state)
 
     def save(self):
-        """Save log data to file"""
-        self.log_data["metadata"]["end_time"] = datetime.now().isoformat()
-
-        with open(self.log_file, 'w') as f:
-            json.dump(self.log_data, f, indent=2)
+        """Finish the log file"""
+        self._write({"end_time": datetime.now().isoformat()})
+        self._fh.close()
 
         print(f"\nLog saved to: {self.log_file}")
         return self.log_file
@@ -198,6 +303,28 @@ class SimulationLogger:
 # TRAFFIC CONTROLLER
 # =======================
 
+GREEN_G, GREEN_g = ord('G'), ord('g')
+
+
+@njit("b1(i8[:], b1[:], f8)", cache=True)
+def _decide_switch(halting, green_mask, threshold):
+    """Queue test of should_switch_phase: per-lane halting counts, green lanes"""
+    current_queue = 0
+    total_queue = 0
+    any_green = False
+    for i in range(halting.size):
+        total_queue += halting[i]
+        if green_mask[i]:
+            current_queue += halting[i]
+            any_green = True
+
+    if not any_green:
+        return False
+
+    # Switch if opposing queue is significantly larger
+    return total_queue - current_queue > current_queue + threshold
+
+
 class AdaptiveTrafficController:
     """
     Adaptive traffic light controller that adjusts timing based on traffic conditions.
@@ -208,49 +335,68 @@ class AdaptiveTrafficController:
         self.config = config
         self.current_phase_duration = 0
         self.phase_start_time = 0
+        # no switch can happen before this; lets control_step skip the decision
+        self.next_eligible_switch_time = self.phase_start_time + config.MIN_GREEN_TIME
 
         # Get controlled lanes
         self.controlled_lanes = traci.trafficlight.getControlledLanes(tl_id)
         self.controlled_links = traci.trafficlight.getControlledLinks(tl_id)
 
-        print(f"\nController initialized for traffic light: {tl_id}")
-        print(f"  Controlled lanes: {len(set(self.controlled_lanes))}")
-
-    def get_approach_queues(self):
-        """Get queue length for each approach to the intersection"""
-        queues = {}
-
-        for lane in set(self.controlled_lanes):
-            if lane:
-                queue_length = traci.lane.getLastStepHaltingNumber(lane)
-                edge = traci.lane.getEdgeID(lane)
-
-                if edge not in queues:
-                    queues[edge] = 0
-                queues[edge] += queue_length
+        # Static for the whole run: distinct controlled lanes
+        self.unique_lanes = tuple(dict.fromkeys(lane for lane in self.controlled_lanes if lane))
+        # (signal index, lane) for each non-empty controlled link
+        lane_index_list = tuple(
+            (i, lane) for i, lane in enumerate(self.controlled_lanes) if lane
+        )
 
-        return queues
+        # signal index of each link and the position of its lane in unique_lanes
+        lane_pos = {lane: k for k, lane in enumerate(self.unique_lanes)}
+        self.link_signal = np.array([i for i, _ in lane_index_list], dtype=np.intp)
+        self.link_lane = np.array([lane_pos[lane] for _, lane in lane_index_list], dtype=np.intp)
 
-    def get_approach_waiting_times(self):
-        """Get average waiting time for vehicles on each approach"""
-        waiting_times = {}
+        # Green lanes are fixed per phase of the program: one mask per phase index
+        phases = traci.trafficlight.getAllProgramLogics(tl_id)[0].phases
+        self.phase_count = len(phases)
+        self.green_by_phase = tuple(self.green_mask(phase.state) for phase in phases)
 
-        for lane in set(self.controlled_lanes):
-            if lane:
-                vehicles = traci.lane.getLastStepVehicleIDs(lane)
-                edge = traci.lane.getEdgeID(lane)
+        for lane in self.unique_lanes:
+            traci.lane.subscribe(lane, LANE_VARS)
+        # current phase arrives with each step; SUMO can advance phases on
+        # its own, so it is read back rather than tracked locally
+        traci.trafficlight.subscribe(tl_id, TL_VARS)
 
-                if vehicles:
-                    avg_wait = sum(traci.vehicle.getWaitingTime(v) for v in vehicles) / len(vehicles)
-                    waiting_times[edge] = avg_wait
-                else:
-                    waiting_times[edge] = 0.0
+        print(f"\nController initialized for traffic light: {tl_id}")
+        print(f"  Controlled lanes: {len(self.unique_lanes)}")
+
+    def green_mask(self, state):
+        """Boolean mask over unique_lanes of lanes with a green signal in state"""
+        signals = np.frombuffer(state.encode('ascii'), dtype=np.uint8)
+        present = self.link_signal < signals.size
+        signals = signals[self.link_signal[present]]
+
+        mask = np.zeros(len(self.unique_lanes), dtype=np.bool_)
+        mask[self.link_lane[present][(signals == GREEN_G) | (signals == GREEN_g)]] = True
+        return mask
+
+    def get_lane_halting(self, lane_data=None):
+        """Halting vehicle count of each lane in unique_lanes, as an int64 array"""
+        if lane_data is None:
+            lane_data = traci.lane.getAllSubscriptionResults()
+        return np.fromiter(
+            (lane_data[lane][tc.LAST_STEP_VEHICLE_HALTING_NUMBER] for lane in self.unique_lanes),
+            dtype=np.int64, count=len(self.unique_lanes)
+        )
 
-        return waiting_times
+    def snapshot(self, lane_data=None):
+        """Lane halting counts and total queue for this step"""
+        halting = self.get_lane_halting(lane_data)
+        return halting, int(halting.sum())
 
-    def should_switch_phase(self, sim_time):
+    def should_switch_phase(self, sim_time, snapshot, tl_data=None):
         """
         Decide if we should switch to the next traffic light phase.
+        snapshot is this step's result of self.snapshot(), tl_data this
+        light's subscription results (fetched if not given).
         """
         phase_duration = sim_time - self.phase_start_time
 
@@ -262,44 +408,33 @@ class AdaptiveTrafficController:
         if phase_duration >= self.config.MAX_GREEN_TIME:
             return True
 
-        # Get current traffic state
-        queues = self.get_approach_queues()
-        waiting_times = self.get_approach_waiting_times()
+        halting, _ = snapshot
 
-        # Get current phase
-        current_phase = traci.trafficlight.getPhase(self.tl_id)
-        current_state = traci.trafficlight.getRedYellowGreenState(self.tl_id)
+        # Lanes with a green signal in the current phase
+        if tl_data is None:
+            tl_data = traci.trafficlight.getSubscriptionResults(self.tl_id)
+        current_phase = tl_data[tc.TL_CURRENT_PHASE]
+        green_mask = self.green_by_phase[current_phase]
 
         # Simple heuristic: switch if current green lanes have small queue
         # and other approaches have large queues
-        current_green_lanes = [
-            lane for i, lane in enumerate(self.controlled_lanes)
-            if lane and i < len(current_state) and current_state[i] in ['G', 'g']
-        ]
-
-        if current_green_lanes:
-            current_queue = sum(
-                traci.lane.getLastStepHaltingNumber(lane)
-                for lane in set(current_green_lanes)
-            )
-            total_queue = sum(queues.values())
-            other_queue = total_queue - current_queue
+        return bool(_decide_switch(halting, green_mask, float(self.config.QUEUE_THRESHOLD)))
 
-            # Switch if opposing queue is significantly larger (uses config threshold)
-            if other_queue > current_queue + self.config.QUEUE_THRESHOLD:
-                return True
+    def control_step(self, sim_time, snapshot, tl_data=None):
+        """Execute one control step"""
+        if sim_time < self.next_eligible_switch_time:
+            return False
 
-        return False
+        if tl_data is None:
+            tl_data = traci.trafficlight.getSubscriptionResults(self.tl_id)
 
-    def control_step(self, sim_time):
-        """Execute one control step"""
-        if self.should_switch_phase(sim_time):
-            current_phase = traci.trafficlight.getPhase(self.tl_id)
-            phase_count = len(traci.trafficlight.getAllProgramLogics(self.tl_id)[0].phases)
-            next_phase = (current_phase + 1) % phase_count
+        if self.should_switch_phase(sim_time, snapshot, tl_data):
+            current_phase = tl_data[tc.TL_CURRENT_PHASE]
+            next_phase = (current_phase + 1) % self.phase_count
 
             traci.trafficlight.setPhase(self.tl_id, next_phase)
             self.phase_start_time = sim_time
+            self.next_eligible_switch_time = sim_time + self.config.MIN_GREEN_TIME
 
             return True  # Phase switched
 
@@ -310,21 +445,45 @@ class AdaptiveTrafficController:
 # MAIN SIMULATION
 # =======================
 
-def collect_vehicle_data():
-    """Collect data about all vehicles in simulation"""
-    vehicles = []
-
-    for veh_id in traci.vehicle.getIDList():
-        vehicles.append({
-            "id": veh_id,
-            "position": traci.vehicle.getPosition(veh_id),
-            "speed": traci.vehicle.getSpeed(veh_id),
-            "waiting_time": traci.vehicle.getWaitingTime(veh_id),
-            "lane": traci.vehicle.getLaneID(veh_id),
-            "edge": traci.vehicle.getRoadID(veh_id)
-        })
+def subscribe_new_vehicles(departed):
+    """Subscribe vehicles that entered the network in the last step"""
+    for veh_id in departed:
+        traci.vehicle.subscribe(veh_id, VEHICLE_VARS)
 
-    return vehicles
+
+def collect_vehicle_metrics(results=None):
+    """Waiting times and speeds of all vehicles as NumPy arrays"""
+    if results is None:
+        results = traci.vehicle.getAllSubscriptionResults()
+
+    waiting_times = np.fromiter(
+        (sub[tc.VAR_WAITING_TIME] for sub in results.values()),
+        dtype=np.float64, count=len(results)
+    )
+    speeds = np.fromiter(
+        (sub[tc.VAR_SPEED] for sub in results.values()),
+        dtype=np.float64, count=len(results)
+    )
+
+    return waiting_times, speeds
+
+
+def collect_vehicle_data(results=None):
+    """Collect data about all vehicles in simulation as parallel columns"""
+    if results is None:
+        results = traci.vehicle.getAllSubscriptionResults()
+    subs = results.values()
+    positions = [sub[tc.VAR_POSITION] for sub in subs]
+
+    return {
+        "ids": list(results),
+        "x": [p[0] for p in positions],
+        "y": [p[1] for p in positions],
+        "speed": [sub[tc.VAR_SPEED] for sub in subs],
+        "waiting_time": [sub[tc.VAR_WAITING_TIME] for sub in subs],
+        "lane": [sub[tc.VAR_LANE_ID] for sub in subs],
+        "edge": [sub[tc.VAR_ROAD_ID] for sub in subs]
+    }
 
 
 def collect_traffic_light_data(tl_ids):
@@ -349,7 +508,14 @@ def run_simulation(config):
 
     # Start SUMO
     sumo_binary = "sumo" if not config.USE_GUI else "sumo-gui"
-    sumo_cmd = [sumo_binary, "-c", config.SUMO_CFG]
+    sumo_cmd = [
+        sumo_binary, "-c", config.SUMO_CFG,
+        "--step-length", str(config.STEP_LENGTH),
+        # keep SUMO's own console output out of the loop
+        "--no-step-log", "--no-warnings", "--duration-log.disable",
+    ]
+    if config.SEED is not None:
+        sumo_cmd.extend(["--seed", str(config.SEED)])
     if config.USE_GUI:
         sumo_cmd.extend(["--start", "--quit-on-end"])
 
@@ -360,6 +526,9 @@ def run_simulation(config):
         traci.close()
 
     traci.start(sumo_cmd)
+    # time and departures arrive with each step; arrived vehicles drop their
+    # own subscriptions, so only departures need tracking
+    traci.simulation.subscribe([tc.VAR_TIME, tc.VAR_DEPARTED_VEHICLES_IDS])
 
     # Initialize controller and logger
     tl_ids = traci.trafficlight.getIDList()
@@ -373,29 +542,38 @@ def run_simulation(config):
     metrics = TrafficMetrics(config)
 
     print(f"\nRunning simulation...")
-    last_log_time = 0
+    # log every LOG_INTERVAL seconds of simulated time, counted in steps
+    log_every = max(1, round(config.LOG_INTERVAL / traci.simulation.getDeltaT()))
     phase_switches = 0
 
     # Main simulation loop
     for step in range(config.SIMULATION_STEPS):
         traci.simulationStep()
-        sim_time = traci.simulation.getTime()
+        sim_state = traci.simulation.getSubscriptionResults()
+        subscribe_new_vehicles(sim_state[tc.VAR_DEPARTED_VEHICLES_IDS])
+        sim_time = sim_state[tc.VAR_TIME]
+
+        # Fetch each domain's subscription results once and hand them around
+        vehicle_data = traci.vehicle.getAllSubscriptionResults()
+        lane_data = traci.lane.getAllSubscriptionResults()
+        tl_sub = traci.trafficlight.getSubscriptionResults(controller.tl_id)
+
+        # One lane scan per step, shared by the controller and the metrics
+        snapshot = controller.snapshot(lane_data)
+        total_queue = snapshot[1]
 
         # Execute controller
-        if controller.control_step(sim_time):
+        if controller.control_step(sim_time, snapshot, tl_sub):
             phase_switches += 1
 
-        # Collect metrics
-        vehicles = collect_vehicle_data()
-        waiting_times = [v["waiting_time"] for v in vehicles]
-        speeds = [v["speed"] for v in vehicles]
-        queues = controller.get_approach_queues()
-        total_queue = sum(queues.values())
+        # Collect metrics (per-vehicle rows are only built for logged steps)
+        waiting_times, speeds = collect_vehicle_metrics(vehicle_data)
 
         metrics.update(waiting_times, speeds, total_queue)
 
         # Log at intervals
-        if sim_time - last_log_time >= config.LOG_INTERVAL:
+        if (step + 1) % log_every == 0:
+            vehicles = collect_vehicle_data(vehicle_data)
             tl_data = collect_traffic_light_data(tl_ids)
             current_metrics = metrics.calculate()
 
@@ -403,13 +581,11 @@ def run_simulation(config):
 
             # Print progress
             print(f"  t={sim_time:3.0f}s: "
-                  f"vehicles={len(vehicles):3d}, "
+                  f"vehicles={len(vehicles['ids']):3d}, "
                   f"queue={total_queue:3.0f}, "
                   f"avg_wait={current_metrics['avg_waiting_time']:5.1f}s, "
                   f"objective={current_metrics['objective_value']:6.1f}")
 
-            last_log_time = sim_time
-
     # Final metrics
     final_metrics = metrics.calculate()
 
@@ -437,27 +613,37 @@ def run_simulation(config):
     }
 
 
+def run_config_file(config_file):
+    """Load a config file and run it (picklable entry point for worker processes)"""
+    return run_simulation(Config.from_json(config_file))
+
+
+def print_result(result):
+    """Print the summary block for one finished run"""
+    print(f"\n{'='*60}")
+    print(f"SUCCESS!")
+    print(f"{'='*60}")
+    print(f"Config: {result['config_name']}")
+    print(f"Objective: {result['metrics']['objective_value']:.2f}")
+    print(f"Log: {result['log_file']}")
+
+
 if __name__ == "__main__":
-    # Get config file from command line or use default
-    if len(sys.argv) > 1:
-        config_file = sys.argv[1]
-    else:
-        config_file = "configs/adaptive_config.json"
+    # Get config files from command line or use default
+    config_files = sys.argv[1:] or ["configs/adaptive_config.json"]
 
     try:
-        # Load configuration
-        config = Config(config_file)
-
-        # Run simulation
-        result = run_simulation(config)
-
-        if result:
-            print(f"\n{'='*60}")
-            print(f"SUCCESS!")
-            print(f"{'='*60}")
-            print(f"Config: {result['config_name']}")
-            print(f"Objective: {result['metrics']['objective_value']:.2f}")
-            print(f"Log: {result['log_file']}")
+        if len(config_files) == 1:
+            results = [run_config_file(config_files[0])]
+        else:
+            # each worker process starts its own SUMO (or libsumo) instance
+            workers = min(len(config_files), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(run_config_file, config_files))
+
+        for result in results:
+            if result:
+                print_result(result)
 
     except Exception as e:
         print(f"\nERROR: {e}")
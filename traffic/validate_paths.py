@@ -2,9 +2,51 @@
 """Validate that all file paths are correctly configured"""
 
 import json
-import xml.etree.ElementTree as ET
+import os
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    from lxml import etree as ET  # C parser, same iterparse API
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+SUMO_INPUT_TAGS = ("net-file", "route-files")
+
+
+@lru_cache(maxsize=None)
+def dir_entries(directory):
+    """Case-normalised names in directory, listed once (empty if it does not exist)"""
+    try:
+        with os.scandir(directory) as it:
+            return frozenset(os.path.normcase(entry.name) for entry in it)
+    except FileNotFoundError:
+        return frozenset()
+
+
+def path_exists(path):
+    """Path.exists(), answered from a cached scandir of the parent when listed there"""
+    path = Path(path)
+    if os.path.normcase(path.name) in dir_entries(str(path.parent)):
+        return True
+    # not in the listing ('.', '..', or a name the listing can't match): ask the filesystem
+    return path.exists()
+
+
+def find_sumo_inputs(sumo_cfg_path):
+    """Map each SUMO_INPUT_TAGS tag to its value attribute, streaming the config"""
+    found = {}
+    # binary stream: the parser handles the XML encoding itself
+    with open(sumo_cfg_path, "rb") as f:
+        for _, elem in ET.iterparse(f, events=("end",)):
+            if elem.tag in SUMO_INPUT_TAGS and elem.tag not in found:
+                found[elem.tag] = elem.get("value")
+                if len(found) == len(SUMO_INPUT_TAGS):
+                    break
+            elem.clear()
+    return found
+
+
 def validate_paths():
     """Validate all file paths in the configuration"""
     errors = []
@@ -20,7 +62,7 @@ def validate_paths():
         config_path = Path(config_file)
         print(f"\n[1] Checking {config_file}...")
 
-        if not config_path.exists():
+        if not path_exists(config_path):
             errors.append(f"  [X] Config file not found: {config_file}")
             continue
         print(f"  [OK] Config file exists")
@@ -37,38 +79,35 @@ def validate_paths():
         sumo_cfg_path = Path(sumo_cfg)
         print(f"  -> References: {sumo_cfg}")
 
-        if not sumo_cfg_path.exists():
+        if not path_exists(sumo_cfg_path):
             errors.append(f"  [X] SUMO config not found: {sumo_cfg}")
             continue
         print(f"  [OK] SUMO config exists")
 
         # Parse SUMO config and check XML file references
         print(f"\n[2] Checking {sumo_cfg}...")
-        tree = ET.parse(sumo_cfg_path)
-        root = tree.getroot()
+        inputs = find_sumo_inputs(sumo_cfg_path)
 
         # Check network file
-        net_file = root.find(".//net-file")
-        if net_file is not None:
-            net_path_str = net_file.get("value")
+        net_path_str = inputs.get("net-file")
+        if net_path_str is not None:
             # Resolve relative to the SUMO config file location
             net_path = (sumo_cfg_path.parent / net_path_str).resolve()
             print(f"  -> Network file: {net_path_str}")
 
-            if not net_path.exists():
+            if not path_exists(net_path):
                 errors.append(f"  [X] Network file not found: {net_path}")
             else:
                 print(f"  [OK] Network file exists: {net_path}")
 
         # Check route files
-        route_files = root.find(".//route-files")
-        if route_files is not None:
-            route_path_str = route_files.get("value")
+        route_path_str = inputs.get("route-files")
+        if route_path_str is not None:
             # Resolve relative to the SUMO config file location
             route_path = (sumo_cfg_path.parent / route_path_str).resolve()
             print(f"  -> Route file: {route_path_str}")
 
-            if not route_path.exists():
+            if not path_exists(route_path):
                 errors.append(f"  [X] Route file not found: {route_path}")
             else:
                 print(f"  [OK] Route file exists: {route_path}")
@@ -76,14 +115,14 @@ def validate_paths():
     # Check network directory
     print(f"\n[3] Checking network directory...")
     network_dir = Path("network")
-    if not network_dir.exists():
+    if not path_exists(network_dir):
         errors.append("  [X] network/ directory not found")
     else:
         print(f"  [OK] network/ directory exists")
         xml_files = ["network.nod.xml", "network.edg.xml", "network.net.xml", "routes.rou.xml"]
         for xml_file in xml_files:
             xml_path = network_dir / xml_file
-            if not xml_path.exists():
+            if not path_exists(xml_path):
                 errors.append(f"  [X] Missing: {xml_path}")
             else:
                 print(f"  [OK] {xml_file}")